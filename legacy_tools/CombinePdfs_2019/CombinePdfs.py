@@ -24,8 +24,18 @@
 #          21-Jan-2017  Revise to let users specify output path and file name
 #          22-Jan-2017  Revise hardcopy and in-tool documentation
 #          16-Jun-2019  Revise to exit if spaces are detected in file names or paths
+#          15-Oct-2026  Revise to combine with pikepdf or pypdf, when available, so the
+#                       output is written once instead of being rewritten on each append
 #=========================================================================================
-import arcpy, os, sys
+import arcpy, os, re, sys
+try:
+    import pikepdf  ## Appends page objects by reference with libqpdf
+except ImportError:
+    pikepdf = None  ## Fall back to pypdf where pikepdf is not installed
+try:
+    from pypdf import PdfWriter  ## Writes the combined PDF once, after all pages are appended
+except ImportError:
+    PdfWriter = None  ## Fall back to arcpy.mapping where pypdf is not installed
 arcpy.AddMessage("\n\n" + "Combine PDFs was developed by Carl Beyerhelm, Circle-5 GeoServices LLC" + "\n")
 
 try:
@@ -35,29 +45,51 @@ try:
     outName   = arcpy.GetParameterAsText(2)  ## User-supplied name for the output PDF
 
     # Prepare for processing.
-    if " " in pdfList:  ## Test for spaces in the input PDF file names or paths
-        arcpy.AddMessage("\n" + "Can't continue because a space occurs in the input PDF file names or paths...")
+    whiteSpace = re.compile(r"\s")  ## Matches spaces, tabs, and any other white space
+    if whiteSpace.search(pdfList):  ## Test for white space in the input PDF file names or paths
+        arcpy.AddMessage("\n" + "Can't continue because white space occurs in the input PDF file names or paths...")
         sys.exit()
-    if " " in outFolder:  ## Test for spaces in the output folder
-        arcpy.AddMessage("\n" + "Can't continue because a space occurs in the output folder path...")
+    if whiteSpace.search(outFolder):  ## Test for white space in the output folder
+        arcpy.AddMessage("\n" + "Can't continue because white space occurs in the output folder path...")
         sys.exit()
-    if " " in outName:  ## Test for spaces in the output PDF file name
-        arcpy.AddMessage("\n" + "Can't continue because a space occurs in the output PDF file name...")
+    if whiteSpace.search(outName):  ## Test for white space in the output PDF file name
+        arcpy.AddMessage("\n" + "Can't continue because white space occurs in the output PDF file name...")
         sys.exit()
-    if outName[-4:].lower() <> ".pdf":  ## Check for .pdf file extension
+    if outName[-4:].lower() != ".pdf":  ## Check for .pdf file extension
         outName += ".pdf"
     pdfList = pdfList.split(";")  ## Convert the pdfList string into a Python list
 
     # Create and build the output PDF file.
-    outPdf = arcpy.mapping.PDFDocumentCreate(os.path.join(outFolder, outName))  ## Create an empty PDF document
-    for pdf in pdfList:
-        arcpy.AddMessage("\n" + "Combining " + os.path.basename(pdf))
-        outPdf.appendPages(pdf)  ## Combine each document in pdfList
-    outPdf.saveAndClose()  ## Save and close the output PDF
+    arcpy.AddMessage("".join(["\n" + "Combining " + os.path.basename(pdf) for pdf in pdfList]))  ## Report all documents in a single message
+    if pikepdf:
+        outPdf  = pikepdf.Pdf.new()  ## Create an empty PDF document in memory
+        srcPdfs = []  ## Source documents must stay open until the output PDF is saved
+        try:
+            for pdf in pdfList:
+                srcPdfs.append(pikepdf.open(pdf))
+                outPdf.pages.extend(srcPdfs[-1].pages)  ## Combine each document in pdfList
+            with open(os.path.join(outFolder, outName), "wb", 1 << 20) as outFile:  ## Buffer writes in 1 MB blocks
+                outPdf.save(outFile)  ## Write the output PDF once
+        finally:
+            for srcPdf in srcPdfs:
+                srcPdf.close()
+            outPdf.close()
+    elif PdfWriter:
+        outPdf = PdfWriter()  ## Create an empty PDF document in memory
+        for pdf in pdfList:
+            outPdf.append(pdf)  ## Combine each document in pdfList
+        with open(os.path.join(outFolder, outName), "wb", 1 << 20) as outFile:  ## Buffer writes in 1 MB blocks
+            outPdf.write(outFile)  ## Write the output PDF once
+    else:
+        outPdf = arcpy.mapping.PDFDocumentCreate(os.path.join(outFolder, outName))  ## Create an empty PDF document
+        for pdf in pdfList:
+            outPdf.appendPages(pdf)  ## Combine each document in pdfList
+        outPdf.saveAndClose()  ## Save and close the output PDF
     arcpy.AddMessage("\n" + "OK, done!" + "\n" + "The output PDF is filed as:")
     arcpy.AddMessage("    " + os.path.join(outFolder, outName) + "\n")
     del outPdf  ## Release the PDF object
-    arcpy.RefreshCatalog(outFolder)
+    if arcpy.GetInstallInfo()["ProductName"] != "ArcGISPro":  ## RefreshCatalog is a no-op in ArcPro
+        arcpy.RefreshCatalog(outFolder)
 except:
     arcpy.AddMessage("\n")
     arcpy.AddError(arcpy.GetMessages(2))
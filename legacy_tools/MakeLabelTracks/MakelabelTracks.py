@@ -2,9 +2,14 @@
 # Creates Division and Branch label tracks at user-specified distances from Break and Perimeter features
 # 2020-07-07, Carl Beyerhelm, Circle-5 GeoServices LLC, circle5geo@gmail.com
 
-import arcpy, os, sys
+import arcpy, fnmatch, os, sys
 arcpy.AddMessage("\n\n")
 
+if arcpy.GetInstallInfo()["ProductName"] == "ArcGISPro":  ## ArcPro's memory workspace is faster than in_memory
+    memWs = "memory"
+else:                                                     ## ArcMap only has the legacy in_memory workspace
+    memWs = "in_memory"
+
 try:
     # Get user inputs.
     eventPoint     = arcpy.GetParameterAsText(0)  ## The current Event Point feature class
@@ -17,8 +22,9 @@ try:
     # Set environments and variables.
     arcpy.env.overwriteOutput = True                               ## Permit outputs to be overwritten
     arcpy.env.workspace       = os.path.dirname(eventPoint)        ## Set Workspace to the Event GDB
-    eventPolygon = arcpy.ListFeatureClasses("*Event*Polygon*")[0]  ## Conjure the EventPolygon feature class
-    eventLabelPt = arcpy.ListFeatureClasses("*Label*Point*")[0]    ## Conjure the LabelPoint feature class
+    eventFcList  = arcpy.ListFeatureClasses()                      ## List the Event GDB feature classes once
+    eventPolygon = [fc for fc in eventFcList if fnmatch.fnmatch(fc.lower(), "*event*polygon*")][0]  ## Conjure the EventPolygon feature class
+    eventLabelPt = [fc for fc in eventFcList if fnmatch.fnmatch(fc.lower(), "*label*point*")][0]    ## Conjure the LabelPoint feature class
 
     # Create a polygon representing Break and Perimeter features.
     arcpy.MakeFeatureLayer_management(eventPolygon, "xxFirePolygon",
@@ -32,67 +38,44 @@ try:
     if int(arcpy.GetCount_management("xxBreakPoints").getOutput(0)) < 2:
         arcpy.AddMessage("Can't continue!  Less than 2 " + incidentName + " Division or Branch break features can be found!" + "\n\n")    ## Bail if less than 2 incident break features are found
         sys.exit()
-    arcpy.PointsToLine_management("xxBreakPoints", "in_memory\\xxLine1", "#", "Label", "CLOSE")          ## Create a line from the sequenced Division and Branch points
-    arcpy.FeatureToPolygon_management("in_memory\\xxLine1", "in_memory\\xxPoly1", "#", "NO_ATTRIBUTES")  ## Create a Break feature polygon from the line
-    arcpy.Union_analysis(["xxFirePolygon", "in_memory\\xxPoly1"], "in_memory\\xxPoly2", "ONLY_FID",
+    arcpy.PointsToLine_management("xxBreakPoints", memWs + "\\xxLine1", "#", "Label", "CLOSE")          ## Create a line from the sequenced Division and Branch points
+    arcpy.FeatureToPolygon_management(memWs + "\\xxLine1", memWs + "\\xxPoly1", "#", "NO_ATTRIBUTES")  ## Create a Break feature polygon from the line
+    arcpy.Dissolve_management("xxFirePolygon", memWs + "\\xxFirePoly")                                 ## Merge the Fire Perimeter polygons into a single feature
+    arcpy.Union_analysis([memWs + "\\xxFirePoly", memWs + "\\xxPoly1"], memWs + "\\xxPoly2", "ONLY_FID",
                          "#", "NO_GAPS")                                                                 ## UNION the Fire Perimeter and Break feature polygons, and fill voids
 
     # Create Division and Branch label tracks at user-specified distances from Break and Fire Perimeter features.
-    arcpy.Buffer_analysis("in_memory\\xxPoly2", "in_memory\\xxPoly3", divDistance,    "FULL", "#", "ALL")  ## Buffer xxPoly2 by divDistance
-    arcpy.Buffer_analysis("in_memory\\xxPoly2", "in_memory\\xxPoly4", branchDistance, "FULL", "#", "ALL")  ## Buffer xxPoly2 by branchDistance
-    arcpy.Union_analysis("in_memory\\xxPoly3", "in_memory\\xxPoly5", "ONLY_FID", "#", "NO_GAPS")           ## Fill any voids in xxPoly3
-    arcpy.Union_analysis("in_memory\\xxPoly4", "in_memory\\xxPoly6", "ONLY_FID", "#", "NO_GAPS")           ## Fill any voids in xxPoly4
-    arcpy.CalculateField_management("in_memory\\xxPoly5", "FID_xxPoly3", 0)               ## Set all FID_xxPoly5 to zero
-    arcpy.CalculateField_management("in_memory\\xxPoly6", "FID_xxPoly4", 0)               ## Set all FID_xxPoly6 to zero
-    arcpy.Dissolve_management("in_memory\\xxPoly5", "in_memory\\xxPoly7", "FID_xxPoly3")  ## Dissolve on FID_xxPoly5 to remove all interior polygons
-    arcpy.Dissolve_management("in_memory\\xxPoly6", "in_memory\\xxPoly8", "FID_xxPoly4")  ## Dissolve on FID_xxPoly6 to remove all interior polygons
-    arcpy.FeatureToLine_management("in_memory\\xxPoly7", "in_memory\\xxDivisionTrack")    ## Create the initial Division track as xxDivisionTrack
-    arcpy.FeatureToLine_management("in_memory\\xxPoly8", "in_memory\\xxBranchTrack")      ## Create the initial Branch track as xxBranchTrack
-
-    # Optionally, split initial Division and Branch tracks.
-    if trackSplitter:  ## If trackSplitter was specified
-        arcpy.Intersect_analysis(["in_memory\\xxDivisionTrack", trackSplitter], "in_memory\\xxSplitDivisionPts", "ONLY_FID", "#", "POINT")  ## Create Division split points
-        arcpy.Intersect_analysis(["in_memory\\xxBranchTrack",   trackSplitter], "in_memory\\xxSplitBranchPts",   "ONLY_FID", "#", "POINT")  ## Create Branch split points
-        arcpy.SplitLineAtPoint_management("in_memory\\xxDivisionTrack", "in_memory\\xxSplitDivisionPts", "in_memory\\xxDivTrackSplit",    "5 meters")  ## Split xxDivisionTrack
-        arcpy.SplitLineAtPoint_management("in_memory\\xxBranchTrack",   "in_memory\\xxSplitBranchPts",   "in_memory\\xxBranchTrackSplit", "5 meters")  ## Split xxBranchTrack
-
-        # Populate the attributes of xxDivTrackSplit from the nearest Division label point.
-        fieldMap = "Label     'Label'     true true false 50 Text 0 0, First, #, Label_Point0, Label,     -1, -1; \
-                    Label2    'Label2'    true true false 50 Text 0 0, First, #, Label_Point0, Label2,    -1, -1; \
-                    LabelType 'LabelType' true true false 50 Text 0 0, First, #, Label_Point0, LabelType, -1, -1"       ## Set up field mapping for subsequent spatial joins
-        arcpy.MakeFeatureLayer_management(eventLabelPt, "xxLabelPoints",
-                                          "IncidentName = '" + incidentName + "' and LabelType = 'Division'")           ## Filter on Division label points
-        divLblCount = int(arcpy.GetCount_management("xxLabelPoints").getOutput(0))                                      ## The count of Division labels
-        arcpy.SpatialJoin_analysis("in_memory\\xxDivTrackSplit", "xxLabelPoints", "in_memory\\xxDivTrackLabelled",
-                                   "JOIN_ONE_TO_ONE", "KEEP_ALL", fieldMap, "CLOSEST")                                  ## Join labels to xxDivTrackSplit
-        outDivTrack = os.path.join(outWorkspace, "LabelTrack_Division")                                                 ## Establish the Division label track's path and name
-        arcpy.Dissolve_management("in_memory\\xxDivTrackLabelled", outDivTrack, ["Label", "Label2", "LabelType"],
-                                  "#", "SINGLE_PART", "UNSPLIT_LINES")                                                  ## Dissolve adjoining track segments having idential attributes
-
-        # Populate the attributes of xxBranchTrackSplit from the nearest Branch label point.
-        arcpy.MakeFeatureLayer_management(eventLabelPt, "xxLabelPoints",
-                                          "IncidentName = '" + incidentName + "' and LabelType = 'Branch or Zone'")     ## Filter on Branch label points
-        branchLblCount = int(arcpy.GetCount_management("xxLabelPoints").getOutput(0))                                   ## The count of Branch labels
-        arcpy.SpatialJoin_analysis("in_memory\\xxBranchTrackSplit", "xxLabelPoints", "in_memory\\xxBranchTrackLabelled",
-                                   "JOIN_ONE_TO_ONE", "KEEP_ALL", fieldMap, "CLOSEST")                                  ## Join labels to xxBranchTrackSplit
-        outBranchTrack = os.path.join(outWorkspace, "LabelTrack_Branch")                                                ## Establish the Branch label track's path and name
-        arcpy.Dissolve_management("in_memory\\xxBranchTrackLabelled", outBranchTrack, ["Label", "Label2", "LabelType"],
-                                  "#", "SINGLE_PART", "UNSPLIT_LINES")                                                  ## Dissolve adjoining track segments having idential attributes
-        arcpy.Delete_management("xxLabelPoints")                                                                        ## Delete temporary feature layer
-        if divLblCount + branchLblCount < breakCount:                                                                   ## Break labels are fewer than the minimum of break features
-            arcpy.AddMessage("Warning - Be alert for missing Division or Branch labels!" + "\n\n")
-    else:  ## If trackSplitter was not specified
-        arcpy.FeatureClassToFeatureClass_conversion("in_memory\\xxDivisionTrack", outWorkspace, "LabelTrack_Division")  ## Create the unsplit LabelTrack_Division feature class
-        arcpy.FeatureClassToFeatureClass_conversion("in_memory\\xxBranchTrack",   outWorkspace, "LabelTrack_Branch")    ## Create the unsplit LabelTrack_Branch feature class
+    fieldMap = "Label     'Label'     true true false 50 Text 0 0, First, #, Label_Point0, Label,     -1, -1; \
+                Label2    'Label2'    true true false 50 Text 0 0, First, #, Label_Point0, Label2,    -1, -1; \
+                LabelType 'LabelType' true true false 50 Text 0 0, First, #, Label_Point0, LabelType, -1, -1"  ## Set up field mapping for subsequent spatial joins
+    lblCount = 0  ## The count of Division and Branch labels
+    for track, distance, labelType in [("Division", divDistance,    "Division"),
+                                       ("Branch",   branchDistance, "Branch or Zone")]:  ## Build each track the same way, one after the other
+        xx = memWs + "\\xx" + track                                                                         ## Prefix for the track's in-memory feature classes
+        outTrack = os.path.join(outWorkspace, "LabelTrack_" + track)                                         ## Establish the label track's path and name
+        arcpy.Buffer_analysis(memWs + "\\xxPoly2", xx + "Buffer", distance, "FULL", "#", "ALL")            ## Buffer xxPoly2 by the track's distance
+        arcpy.Union_analysis(xx + "Buffer", xx + "Filled", "ONLY_FID", "#", "NO_GAPS")                       ## Fill any voids in the buffer
+        arcpy.Dissolve_management(xx + "Filled", xx + "Outline")                                             ## Dissolve all of the filled buffer to remove all interior polygons
+        arcpy.FeatureToLine_management(xx + "Outline", xx + "Track")                                         ## Create the initial track
 
-        # Clean up fields in output.
-        arcpy.env.workspace = outWorkspace
-        arcpy.DeleteField_management("LabelTrack_Division", "FID_xxPoly3")
-        arcpy.DeleteField_management("LabelTrack_Division", "FID_xxPoly7")
-        arcpy.DeleteField_management("LabelTrack_Branch",   "FID_xxPoly4")
-        arcpy.DeleteField_management("LabelTrack_Branch",   "FID_xxPoly8")
-        arcpy.AddField_management(   "LabelTrack_Division", "Label", "TEXT", "#", "#", 20)
-        arcpy.AddField_management(   "LabelTrack_Branch",   "Label", "TEXT", "#", "#", 20)
+        # Optionally, split the initial track and populate its attributes from the nearest label point.
+        if trackSplitter:  ## If trackSplitter was specified
+            arcpy.Intersect_analysis([xx + "Track", trackSplitter], xx + "SplitPts", "ONLY_FID", "#", "POINT")  ## Create split points
+            arcpy.SplitLineAtPoint_management(xx + "Track", xx + "SplitPts", xx + "TrackSplit", "5 meters")    ## Split the track
+            arcpy.MakeFeatureLayer_management(eventLabelPt, "xxLabelPoints",
+                                              "IncidentName = '" + incidentName + "' and LabelType = '" + labelType + "'")  ## Filter on the track's label points
+            lblCount += int(arcpy.GetCount_management("xxLabelPoints").getOutput(0))                         ## Add to the count of labels
+            arcpy.SpatialJoin_analysis(xx + "TrackSplit", "xxLabelPoints", xx + "TrackLabelled",
+                                       "JOIN_ONE_TO_ONE", "KEEP_ALL", fieldMap, "CLOSEST")                   ## Join labels to the split track
+            arcpy.Dissolve_management(xx + "TrackLabelled", outTrack, ["Label", "Label2", "LabelType"],
+                                      "#", "SINGLE_PART", "UNSPLIT_LINES")                                   ## Dissolve adjoining track segments having idential attributes
+            arcpy.Delete_management("xxLabelPoints")                                                         ## Delete temporary feature layer
+        else:  ## If trackSplitter was not specified
+            arcpy.FeatureClassToFeatureClass_conversion(xx + "Track", outWorkspace, "LabelTrack_" + track)  ## Create the unsplit label track feature class
+            arcpy.DeleteField_management(outTrack, "FID_xx" + track + "Outline")                             ## Clean up fields in output
+            arcpy.AddField_management(outTrack, "Label", "TEXT", "#", "#", 20)
+    if trackSplitter and lblCount < breakCount:  ## Break labels are fewer than the minimum of break features
+        arcpy.AddMessage("Warning - Be alert for missing Division or Branch labels!" + "\n\n")
 
 except SystemExit:
     pass
@@ -108,9 +91,10 @@ finally:
     if arcpy.Exists("xxLabelPoints"):
         arcpy.Delete_management("xxLabelPoints")
 
-    # Delete temporary in_memory feature layers.
-    arcpy.env.workspace = "in_memory"
-    tempList = arcpy.ListFeatureClasses("xx*")
-    for temp in tempList:
-        if arcpy.Exists(temp):
-            arcpy.Delete_management(temp)
\ No newline at end of file
+    # Delete temporary in-memory feature classes.
+    try:
+        arcpy.env.workspace = memWs
+        for temp in arcpy.ListFeatureClasses("xx*"):  ## Only this tool's xx* feature classes, not others sharing the workspace
+            arcpy.Delete_management(temp)
+    except:
+        pass
\ No newline at end of file
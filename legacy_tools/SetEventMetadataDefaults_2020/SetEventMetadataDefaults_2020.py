@@ -55,53 +55,55 @@
 #               only the records of the specified target incident
 # 25 May 2020 - Add code to accommodate either ArcMap or ArcPro
 # 30 May 2020 - Add code to permit setting the FeatureStatus default value to "Approved"
+# 15 Oct 2026 - Update an incident's MISSING attribute values in a single UpdateCursor
+#               pass per feature class instead of a select and calculate per field
 #=========================================================================================
 import arcpy, os
 
 # Accept user inputs.
 incident     = arcpy.GetParameterAsText( 0)             ## The value indicating which incident's metadata collection was selected
 editGdb      = arcpy.GetParameterAsText( 1)             ## The local edit Event GDB that metadata values will be applied to
-incidentName = arcpy.GetParameterAsText( 2).strip(" ")  ## The IncidentName metadata value  
-unitId       = arcpy.GetParameterAsText( 3).strip(" ")  ## The UnitID metadata value
-localId      = arcpy.GetParameterAsText( 4).strip(" ")  ## The LocalIncidentID metadata value
-irwinId      = arcpy.GetParameterAsText( 5).strip(" ")  ## The IrwinID metadata value
-imtName      = arcpy.GetParameterAsText( 6).strip(" ")  ## The IMTName metadata value
-incidentGacc = arcpy.GetParameterAsText( 7).strip(" ")  ## The GACC metadata value
-contactName  = arcpy.GetParameterAsText( 8).strip(" ")  ## The ContactName metadata value
-contactEmail = arcpy.GetParameterAsText( 9).strip(" ")  ## The ContactEmail metadata value
-contactPhone = arcpy.GetParameterAsText(10).strip(" ")  ## The ContactPhone metadata value
+incidentName = arcpy.GetParameterAsText( 2).strip()     ## The IncidentName metadata value  
+unitId       = arcpy.GetParameterAsText( 3).strip()     ## The UnitID metadata value
+localId      = arcpy.GetParameterAsText( 4).strip()     ## The LocalIncidentID metadata value
+irwinId      = arcpy.GetParameterAsText( 5).strip()     ## The IrwinID metadata value
+imtName      = arcpy.GetParameterAsText( 6).strip()     ## The IMTName metadata value
+incidentGacc = arcpy.GetParameterAsText( 7).strip()     ## The GACC metadata value
+contactName  = arcpy.GetParameterAsText( 8).strip()     ## The ContactName metadata value
+contactEmail = arcpy.GetParameterAsText( 9).strip()     ## The ContactEmail metadata value
+contactPhone = arcpy.GetParameterAsText(10).strip()     ## The ContactPhone metadata value
 replace      = arcpy.GetParameterAsText(11)             ## The user's attribute table update election
 approved     = arcpy.GetParameter(12)                   ## The user's FeatureStatus default value election
 
-# Set the reporting message variable.
-if editGdb[-12:] != ".geodatabase":  ## Messsage for file geodatabase
-    msg = "Metadata field default values have been updated."
-else:  ## Message for runtime geodatabases
-    msg = "Setting metadata field default values is not supported in runtime geodatabases."
-
 arcpy.AddMessage("\n\n" + "Set Event Metadata Defaults was developed by Carl Beyerhelm, Circle-5 GeoServices LLC" + "\n")
 
 try:
+    # Determine once whether editGdb is a runtime geodatabase.
+    isRuntimeGdb = editGdb.lower().endswith(".geodatabase")
+
+    # Set the reporting message variable.
+    if not isRuntimeGdb:  ## Messsage for file geodatabase
+        msg = "Metadata field default values have been updated."
+    else:  ## Message for runtime geodatabases
+        msg = "Setting metadata field default values is not supported in runtime geodatabases."
+
     # Clear any active selections on TOC layers.
     if arcpy.GetInstallInfo()["ProductName"] == "ArcGISPro":  ## The widget is running in ArcPro
         proProject = arcpy.mp.ArcGISProject("Current")        ## Get a reference to the current ArcPro project
         mapList = proProject.listMaps()                       ## Get a list of the project's maps
-        if len(mapList) > 0:                                  ## If maps are present
-            for map in mapList:                               ## For each map
-                lyrList = map.listLayers()                    ## Get a list of the current map's layers
-                if len(lyrList) > 0:                          ## If layers are present
-                    for lyr in lyrList:                       ## For each layer
-                        if lyr.isFeatureLayer:                ## If the layer is a feature layer
-                            arcpy.SelectLayerByAttribute_management(lyr, "CLEAR_SELECTION")  ## Clear the layer's seletion
-                del lyrList                                   ## Dismiss the lyrList object
-        del mapList, proProject                               ## Dismiss the mapList and proProject objects
+        lyrList = [lyr for map in mapList for lyr in map.listLayers()
+                   if lyr.isFeatureLayer]                     ## Get a list of the feature layers in all of the project's maps
+        for lyr in lyrList:                                   ## For each feature layer
+            if lyr.getSelectionSet():                         ## If the layer has selected features
+                arcpy.SelectLayerByAttribute_management(lyr, "CLEAR_SELECTION")  ## Clear the layer's seletion
+        del lyrList, mapList, proProject                      ## Dismiss the lyrList, mapList and proProject objects
 
     else:                                                     ## The widget is running in ArcMap
         mapDoc  = arcpy.mapping.MapDocument("Current")        ## Get a reference to the current ArcMap document
         lyrList = arcpy.mapping.ListLayers(mapDoc)            ## Get a list of the document's layers
         if len(lyrList) > 0:                                  ## If layers are present
             for lyr in lyrList:                               ## For each layer
-                if lyr.isFeatureLayer:                        ## If the layer is a feature layer
+                if lyr.isFeatureLayer and lyr.getSelectionSet():  ## If the layer is a feature layer with selected features
                     arcpy.SelectLayerByAttribute_management(lyr, "CLEAR_SELECTION")  ## Clear the layer's selection
         del mapDoc, lyrList                                   ## Dismiss the mapDoc and lyrList objects
 
@@ -111,46 +113,52 @@ try:
     metaFolder = os.path.dirname(__file__)  ## Folder containing the master incident metadata table
     metaTable  = os.path.join(metaFolder, "EventMetadataTemplate.gdb\\MetadataDefaults")  ## The master incident metadata table
     if "- - " not in incident:  ## Update an existing record in the master incident metadata table
-        exp = "IncidentName = '" + incident + "'"
+        exp = arcpy.AddFieldDelimiters(metaTable, "IncidentName") + " = '" + incident.replace("'", "''") + "'"  ## An expression identifying the selected incident's record
         with arcpy.da.UpdateCursor(metaTable, fieldList, exp) as uRows:  ## A cursor to update a master incident metadata table record
             for uRow in uRows:
                 for i in range(0, len(fieldList)):
                     uRow[i] = valueList[i]
-                    uRows.updateRow(uRow)
+                uRows.updateRow(uRow)  ## Write the record once, after all of its values are set
         del uRows
     else:  ## Add a new record to the master incident metadata table
-        with arcpy.da.InsertCursor(metaTable, (fieldList)) as iRows:  ## A cursor to add a master incident metadata table record
-            iRows.insertRow((valueList[0], valueList[1], valueList[2], valueList[3], valueList[4],
-                             valueList[5], valueList[6], valueList[7], valueList[8]))
+        with arcpy.da.InsertCursor(metaTable, fieldList) as iRows:  ## A cursor to add a master incident metadata table record
+            iRows.insertRow(tuple(valueList))  ## valueList is already in fieldList order
         del iRows
     arcpy.AddMessage("\n" + "The master incident metadata table has been updated with values from the current session.")
 
     # Apply metadata values from the tool's dialog to field default values.
     arcpy.env.workspace = editGdb                       ## Set the default workspace to editGdb
     fcList = arcpy.ListFeatureClasses()                 ## Get a list of all editGdb feature classes
+    incidentExp = arcpy.AddFieldDelimiters(editGdb, "IncidentName") + " = '" + incidentName.replace("'", "''") + "'"  ## An expression identifying the specified incident's records
+    missingExps = {}                                    ## Expressions identifying null or zero-length values, keyed by metadata field
+    for field in fieldList:
+        missingExps[field] = arcpy.AddFieldDelimiters(editGdb, field) + " = '' or " + arcpy.AddFieldDelimiters(editGdb, field) + " is null"
     for fc in fcList:                                   ## For each feature class in fcList
-        arcpy.MakeFeatureLayer_management(fc, "fcLyr")  ## Create a feature layer from the current feature class
-        fcFields = arcpy.ListFields(fc)                 ## Get a list of fields in the current feature class
-        for fcField in fcFields:                        ## For each field in the current feature class
-            if fcField.name == "FeatureStatus":         ## If the current field's name is FeatureStatus
-                if editGdb[-12:] != ".geodatabase":     ## If editGdb is not a runtime GDB
-                    if approved == True:                ## If the user elected to set the FeatureStatus default to "Approved"
-                        arcpy.AssignDefaultToField_management(fc, "FeatureStatus", "Approved")  ## Set FeatureStatus default to "Approved"
-            if fcField.name in fieldList:               ## If the current fcField is a metadata field
-                i = fieldList.index(fcField.name)       ## Get the fieldList index of the current fcField
-                if editGdb[-12:] != ".geodatabase":     ## If editGdb is not a runtime GDB
-                    arcpy.AssignDefaultToField_management(fc, fieldList[i], valueList[i])     ## Set the indexed field's default value to the new metadata value
+        fcFieldNames = set(fcField.name for fcField in arcpy.ListFields(fc))  ## Get the names of fields in the current feature class
+        updateFields = []                               ## The metadata fields present in the current feature class
+        updateValues = []                               ## The metadata values for updateFields
+        if "FeatureStatus" in fcFieldNames:             ## If the current feature class has a FeatureStatus field
+            if not isRuntimeGdb:                        ## If editGdb is not a runtime GDB
+                if approved == True:                    ## If the user elected to set the FeatureStatus default to "Approved"
+                    arcpy.AssignDefaultToField_management(fc, "FeatureStatus", "Approved")  ## Set FeatureStatus default to "Approved"
+        for i in range(0, len(fieldList)):              ## For each metadata field
+            if fieldList[i] in fcFieldNames:            ## If the metadata field is present in the current feature class
+                if not isRuntimeGdb:                    ## If editGdb is not a runtime GDB
+                    arcpy.AssignDefaultToField_management(fc, fieldList[i], valueList[i])  ## Set the indexed field's default value to the new metadata value
+                updateFields.append(fieldList[i])       ## Add the indexed field to updateFields
+                updateValues.append(valueList[i])       ## Add the indexed field's metadata value to updateValues
 
-                # Apply metadata values from the tool's dialog to MISSING attribute table values.
-                if replace == "Missing":                                                      ## If the user elected to update MISSING values in the attribute table
-                    exp1 = "IncidentName = '" + incidentName + "'"                            ## An expression identifying the specified incident's records
-                    exp2 = fieldList[i].strip(" ") + " = '' or " + fieldList[i] + " is null"  ## An expression identifying null or zero-length metadata values
-                    arcpy.SelectLayerByAttribute_management("fcLyr", "NEW_SELECTION",
-                                                            exp1 + " and (" + exp2 + ")")     ## Select the specified incident's MISSING record values for update
-                    arcpy.CalculateField_management("fcLyr", fieldList[i],
-                                                    '"' + valueList[i] + '"')                 ## Update MISSING metadata attribute values with default values
-                    arcpy.SelectLayerByAttribute_management("fcLyr", "CLEAR_SELECTION")       ## Clear the fcLyr selection
-        arcpy.Delete_management("fcLyr")                                                      ## Dismiss the fcLyr object
+        # Apply metadata values from the tool's dialog to MISSING attribute table values.
+        if replace == "Missing" and updateFields:                                             ## If the user elected to update MISSING values in the attribute table
+            missingExp = " or ".join([missingExps[field] for field in updateFields])            ## An expression identifying null or zero-length metadata values
+            with arcpy.da.UpdateCursor(fc, updateFields,
+                                       incidentExp + " and (" + missingExp + ")") as uRows:   ## A single cursor pass over only the incident's records having MISSING values
+                for uRow in uRows:
+                    for j in range(0, len(updateFields)):
+                        if uRow[j] is None or uRow[j] == "":                                  ## If the record's metadata value is null or zero-length
+                            uRow[j] = updateValues[j]                                         ## Update the MISSING metadata attribute value with the default value
+                    uRows.updateRow(uRow)
+            del uRows
 
         # Report results.
         arcpy.AddMessage("\n" + "Feature class: " + fc + "...")
@@ -163,8 +171,6 @@ try:
     arcpy.AddMessage("\n" + "OK, done." + "\n\n")
 
 except:
-    if arcpy.Exists("fcLyr"):
-        arcpy.Delete_management("fcLyr")
     arcpy.AddError("\n" + "Oops, something is broken..." + "\n")
     arcpy.AddError(arcpy.GetMessages(2))
     arcpy.AddMessage("\n")
\ No newline at end of file
@@ -1,11 +1,43 @@
+# Reference copy of the ToolValidator class embedded in SetEventMetadataDefaults_2020.tbx.
+# Changes made here take effect only once this code is pasted into the tool's Validation tab.
 import arcpy, os
 class ToolValidator(object):
     """Class for validating a tool's parameter values and controlling
     the behavior of the tool's dialog."""
 
+    fields = ("IncidentName", "UnitID", "LocalIncidentID", "IRWINID", "IMTName",
+              "GACC", "ContactName", "ContactEmail", "ContactPhone")  ## Only the metadata fields for params[2] - params[10]
+
     def __init__(self):
         """Setup arcpy and the list of tool parameters."""
         self.params = arcpy.GetParameterInfo()
+        self.inTable = os.path.join(os.path.dirname(__file__),
+                                    "EventMetadataTemplate.gdb\\MetadataDefaults")  ## Specify the table containing metadata defaults
+        self.defaultsTime = None  ## The modification time of the metadata defaults when they were last read
+
+    def loadDefaults(self):
+        """Read the metadata defaults table into a dictionary keyed by
+        IncidentName.  The table is only read again if its geodatabase
+        has changed since the last read."""
+        gdb = os.path.dirname(self.inTable)
+        defaultsTime = None  ## The latest change to any file in the geodatabase
+        try:
+            for f in os.listdir(gdb):
+                if f.lower().endswith(".lock"):  ## Skip lock files, which come and go with other sessions
+                    continue
+                fileTime = os.stat(os.path.join(gdb, f)).st_mtime
+                if defaultsTime is None or fileTime > defaultsTime:
+                    defaultsTime = fileTime
+        except OSError:  ## If a file vanished while being probed, read the table again
+            defaultsTime = None
+        if defaultsTime is not None and defaultsTime == self.defaultsTime:  ## If the table hasn't changed since it was last read
+            return
+        self.defaults = {}  ## Rows of the metadata defaults table, keyed by IncidentName
+        with arcpy.da.SearchCursor(self.inTable, self.fields) as rows:  ## A single pass builds both the picklist and the records
+            for row in rows:
+                self.defaults[row[0]] = row
+        self.incidentList = sorted(["- - I'll enter metadata values for a new incident - -"] + list(self.defaults))  ## The params[0] picklist
+        self.defaultsTime = defaultsTime
 
     def initializeParameters(self):
         """Refine the properties of a tool's parameters.  This method is
@@ -20,35 +52,27 @@ class ToolValidator(object):
         # Get or set the values of params[2] - params[10] based on the value in params[0].
         if self.params[0].value:                     ## If params[0] is not NULL
             if not self.params[0].hasBeenValidated:  ## If the value of params[0] has changed from the prior value of params[0]
-                inTable = os.path.join(os.path.dirname(__file__),
-                                       "EventMetadataTemplate.gdb\\MetadataDefaults")     ## Specify the table containing metadata defaults
-                incidentList = ["- - I'll enter metadata values for a new incident - -"]  ## Initial value of incidentList
-                with arcpy.da.SearchCursor(inTable, "IncidentName") as irows:  ## Set up a search cursor to get a list of incidents
-                    for irow in irows:                                         ## For each row of the metadata defaults table
-                        incidentList.append(irow[0])                           ## Append each value of IncidentName to incidentList
-                incidentList.sort()                                            ## Sort incidentList
-                self.params[0].filter.list = incidentList                      ## Use incidentList as a picklist for params[0]
+                self.loadDefaults()                                   ## Refresh the cached metadata defaults if the table has changed
+                self.params[0].filter.list = self.incidentList        ## Use incidentList as a picklist for params[0]
                 if "- - " in self.params[0].value:   ## If the user elected to enter metadata values for a new incident
                     for i in range(2, 11):
                         self.params[i].value = None  ## Set params[2] - params[10] to NULL
                     self.params[11].value = "None"   ## Set params[11] to "None"
                     self.params[12].value = False    ## Set params[12] to False
                 else:                                ## If the user elected to use an existing metadata collection
-                    with arcpy.da.SearchCursor(inTable, ["IncidentName", "UnitID", "LocalIncidentID", "IRWINID", "IMTName",
-                                                         "GACC", "ContactName", "ContactEmail", "ContactPhone"]) as rows:
-                        for row in rows:
-                            if row[0] == self.params[0].value:
-                                self.params[ 2].value = row[0]  ## Update params[2] - params[10] based on the value of params[0]
-                                self.params[ 3].value = row[1]
-                                self.params[ 4].value = row[2]
-                                self.params[ 5].value = row[3]
-                                self.params[ 6].value = row[4]
-                                self.params[ 7].value = row[5]
-                                self.params[ 8].value = row[6]
-                                self.params[ 9].value = row[7]
-                                self.params[10].value = row[8]
-                                self.params[11].value = "None"  ## Set params[11] to "None"
-                                self.params[12].value = False   ## Set params[12] to False
+                    row = self.defaults.get(self.params[0].value)
+                    if row is None:                  ## If the incident isn't cached, read only its record from the table
+                        exp = (arcpy.AddFieldDelimiters(self.inTable, "IncidentName") + " = '" +
+                               self.params[0].valueAsText.replace("'", "''") + "'")
+                        with arcpy.da.SearchCursor(self.inTable, self.fields, exp) as rows:
+                            for row in rows:
+                                self.defaults[row[0]] = row
+                        row = self.defaults.get(self.params[0].value)
+                    if row is not None:
+                        for i in range(0, 9):
+                            self.params[i + 2].value = row[i]  ## Update params[2] - params[10] based on the value of params[0]
+                        self.params[11].value = "None"         ## Set params[11] to "None"
+                        self.params[12].value = False          ## Set params[12] to False
             else:     ## If the value of params[0] has not changed from the prior value of params[0]
                 pass  ## Leave params[2] - params[12] as is
         else:                                  ## If params[0] is NULL
@@ -60,7 +84,7 @@ class ToolValidator(object):
         # Set the value and enabled status of params[12] based on whether a fGDB or a runtime GDB was specified in params[1].
         if self.params[1].value:                                 ## If params[1] is not NULL
             if not self.params[1].hasBeenValidated:              ## If the value of params[1] has changed from the prior value of params[1]
-                if self.params[1].valueAsText.endswith(".gdb"):  ## If params[1] represents a file geodatabase
+                if not self.params[1].valueAsText.lower().endswith(".geodatabase"):  ## If params[1] does not represent a runtime geodatabase
                     self.params[12].enabled = True               ## Enable params[12] and set its value to False
                     self.params[12].value   = False
                 else:                                            ## If params[1] represents a runtime geodatabase
@@ -61,225 +61,374 @@
 #               a township and range label field
 # 16 Feb 2020 - Added a Python dictionary DISSOLVE parameter for the Trans_RoadSegment FC
 # 02 Apr 2020 - Add code to more explicitly declare the current workspace
+# 15 Oct 2026 - Download or copy, and unzip, topo vector GDBs in parallel
+# 15 Oct 2026 - Strip measures from all clipped features instead of copying NhdFlowline
+# 15 Oct 2026 - Clip polygon and line feature classes into a scratch fGDB, and dissolve
+#               them from there directly into the output fGDB
+# 15 Oct 2026 - Revise Twn-Rng and Sec labels to be constructed with update cursors that
+#               bypass features having a NULL PLSSID or FRSTDIVNO
+# 15 Oct 2026 - Read all clipping quad frames in one query, and bypass GDBs that do not
+#               have a corresponding quad frame
+# 15 Oct 2026 - Download HTTP(S) URLs through a keep-alive requests session per download
+#               thread, when requests is available
+# 15 Oct 2026 - Download or copy each selected quad's zip once, even if it is shared by
+#               several quad index features
 #=========================================================================================
-import arcpy, os, sys, time, urllib, zipfile
-
+import arcpy, ftplib, os, posixpath, shutil, sys, threading, time, urllib, urlparse, zipfile
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
 try:
-    arcpy.AddMessage("\n\n" + "USGS Topo Vector Prep was developed by Carl Beyerhelm, Circle-5 GeoServices LLC")
-    arcpy.AddMessage("Portions adapted from Matt Panunto, DOI-BLM")
-
-    # Accept user input and set environments.
-    topoSource      = arcpy.GetParameterAsText(0)  ## Specify whether topo data are "Local" or "Online"
-    localTopoFolder = arcpy.GetParameterAsText(1)  ## If topo data are local, specify the parent folder containing topo data organized by state abbreviation
-    outputFolder    = arcpy.GetParameterAsText(2)  ## Specify the parent folder where topo data will be downloaded or copied to, unzipped, and processed into a final fGDB
-    aoiFc           = arcpy.GetParameterAsText(3)  ## Specify the AOI polygon layer
-    searchDistance  = arcpy.GetParameterAsText(4)  ## Specify the AOI polygon search distance
-    downloadFolder  = os.path.join(outputFolder, "TopoDownloads")  ## The folder where topo data will be downloaded or copied to
-    timeStamp       = time.strftime("%Y%m%d") + "_" + time.strftime("%H%M")  ## A date/time stamp
-    topoIndex       = os.path.join(os.path.dirname(__file__), "UsgsQuadIndex_75Minute.gdb\\UsgsQuadIndex_75Minute")  ## The 7.5-minute topo index polygon layer
-    arcpy.env.overwriteOutput = True
-    arcpy.env.addOutputsToMap = False
+    import requests  ## Reuses HTTP connections to the USGS host across downloads
+except ImportError:
+    requests = None  ## Fall back to urllib.urlretrieve where requests is not installed
+workerState    = threading.local()  ## Each download thread's own requests session
+workerSessions = []                 ## Every requests session opened by a download thread, to be closed when downloads are done
 
-    # Select topoIndex features that are within searchDistance of aoiFc.
-    arcpy.AddMessage("\n\n" + "Selecting USGS 7.5-minute vector topo GDBs within " + searchDistance + " of AOI features...")
-    arcpy.MakeFeatureLayer_management(topoIndex, "topoLyr")
-    arcpy.SelectLayerByLocation_management("topoLyr", "WITHIN_A_DISTANCE", aoiFc, searchDistance, "NEW_SELECTION")
+# Send buffered progress messages to the tool dialog in a single call, once 32 are waiting or when flush is True.
+def addMessages(msgs, flush=False):
+    if msgs and (flush or len(msgs) >= 32):
+        arcpy.AddMessage("\n".join(msgs))
+        del msgs[:]
 
-    # Create Python lists of each selected quad's primary state abbreviation and URL.
-    primaryStateList = []
-    urlList = []
-    with arcpy.da.SearchCursor("topoLyr", ["PRIM_ABRV", "URL"]) as cursor:
-        for row in cursor:
-            primaryStateList.append(row[0])
-            urlList.append(row[1])
-    arcpy.SelectLayerByAttribute_management("topoLyr", "CLEAR_SELECTION")  ## Clear the selection
-    arcpy.Delete_management("topoLyr")  ## Dismiss topoLyr
-    urlCount = len(urlList)
+# Download one zipped topo vector GDB over its own FTP connection, since urllib's shared FTP cache isn't thread safe.
+def ftpDownload(url, dst):
+    parts = urlparse.urlparse(url)
+    folder, name = posixpath.split(urllib.unquote(parts.path))
+    ftp = ftplib.FTP(timeout=60)
+    try:
+        ftp.connect(parts.hostname, parts.port or 21)
+        ftp.login(parts.username or "anonymous", parts.password or "")
+        if folder:
+            ftp.cwd(folder)
+        with open(dst, "wb") as f:
+            ftp.retrbinary("RETR " + name, f.write, 1 << 20)  ## Write the zip to disk in 1 MB blocks
+    finally:
+        ftp.close()
 
-    # Delete downloadFolder (if it exists), and then recreate it.
-    if arcpy.Exists(downloadFolder):
-        arcpy.Delete_management(downloadFolder)
-    arcpy.CreateFolder_management(outputFolder, "TopoDownloads")
+# Return the calling download thread's own requests session, since requests doesn't promise that sessions are thread safe.
+def workerSession():
+    if not hasattr(workerState, "session"):
+        workerState.session = requests.Session()  ## Keep the thread's connection to the host alive between downloads
+        workerSessions.append(workerState.session)
+    return workerState.session
 
-    # Download selected topo data from online USGS source.
-    if topoSource == "Online":
-        arcpy.AddMessage("\n" + "Downloading:")
-        for i in range(0, urlCount):
+# Download one zipped topo vector GDB, returning its index and whether the download succeeded.
+def downloadQuad(args):
+    i, url, dst = args
+    try:
+        if url.lower().startswith("ftp://"):  ## The USGS quad index lists FTP URLs
+            ftpDownload(url, dst)
+        elif requests and url.lower().startswith(("http://", "https://")):  ## requests only speaks HTTP
+            response = workerSession().get(url, stream=True, timeout=60)
             try:
-                urllib.urlretrieve(urlList[i], os.path.join(downloadFolder, os.path.basename(urlList[i])))
-                urllib.urlcleanup()  ## Clear the download cache
-                arcpy.AddMessage("   "                      + str(i + 1) + " of " + str(urlCount) + " " + os.path.basename(urlList[i]))
-            except:
-                arcpy.AddMessage("   !! Couldn't download " + str(i + 1) + " of " + str(urlCount) + " " + os.path.basename(urlList[i]))
-                pass
+                response.raise_for_status()
+                response.raw.decode_content = True
+                with open(dst, "wb") as f:
+                    shutil.copyfileobj(response.raw, f, 1 << 20)  ## Stream the zip to disk in 1 MB chunks
+            finally:
+                response.close()  ## Return the connection to the thread's session
+        else:
+            urllib.urlretrieve(url, dst)
+        return i, True
+    except:
+        try:
+            os.remove(dst)  ## Don't leave a partial zip behind to be unzipped
+        except OSError:
+            pass
+        return i, False
 
-    # Copy selected topo data from localTopoFolder.
-    else:
-        arcpy.AddMessage("\n" + "Copying:")
-        for i in range(0, urlCount):
-            try:
-                arcpy.Copy_management(os.path.join(localTopoFolder, primaryStateList[i], os.path.basename(urlList[i])),
-                                      os.path.join(downloadFolder, os.path.basename(urlList[i])))
-                arcpy.AddMessage("   "                  + str(i + 1) + " of " + str(urlCount) + " " + os.path.basename(urlList[i]))
+# Copy one zipped topo vector GDB, returning its index and whether the copy succeeded.
+def copyQuad(args):
+    i, src, dst = args
+    try:
+        shutil.copyfile(src, dst)
+        return i, True
+    except:
+        return i, False
 
-            except:
-                arcpy.AddMessage("   !! Couldn't copy " + str(i + 1) + " of " + str(urlCount) + " " + os.path.basename(urlList[i]))
-                pass
+# Extract one zipped topo vector GDB into folder, returning its index and the top-level VECTOR_*.gdb folders it held.
+def unzipQuad(args):
+    i, path, folder = args
+    with zipfile.ZipFile(path) as zip:
+        zip.extractall(folder)
+        gdbNames = set([name.replace("\\", "/").split("/")[0] for name in zip.namelist()])
+    return i, [name for name in gdbNames if name.startswith("VECTOR_") and name.lower().endswith(".gdb")]
 
-    # Unzip the USGS topo vector downloads.
-    arcpy.env.workspace = downloadFolder
-    arcpy.AddMessage("\n" + "Unzipping...")
-    fileList = arcpy.ListFiles("*.zip")
-    zipCount = len(fileList)
-    if zipCount == 0:
-        arcpy.AddMessage("\n" + "Can't continue!!  No USGS topo vector GDBs were downloaded or copied.")
-        sys.exit()
-    for i in range(0, zipCount):
-        zip = zipfile.ZipFile(os.path.join(downloadFolder, fileList[i]))
-        zip.extractall(downloadFolder)
-        arcpy.AddMessage("   " + str(i + 1) + " of " + str(zipCount) + " " + fileList[i])
+# Prepare the USGS topo vector GDB and LYR file from the script tool's parameters.
+def main():
+    scratchGdb = None  ## The scratch fGDB holding undissolved feature classes, once it has been created
+    try:
+        arcpy.AddMessage("\n\n" + "USGS Topo Vector Prep was developed by Carl Beyerhelm, Circle-5 GeoServices LLC")
+        arcpy.AddMessage("Portions adapted from Matt Panunto, DOI-BLM")
 
-    # Create the output GDB.
-    arcpy.AddMessage("\n" + "Creating the output fGDB...")
-    outGdb = "Aoi_VectorTopo_" + timeStamp + ".gdb"
-    arcpy.CreateFileGDB_management(outputFolder, outGdb)
+        # Accept user input and set environments.
+        topoSource      = arcpy.GetParameterAsText(0)  ## Specify whether topo data are "Local" or "Online"
+        localTopoFolder = arcpy.GetParameterAsText(1)  ## If topo data are local, specify the parent folder containing topo data organized by state abbreviation
+        outputFolder    = arcpy.GetParameterAsText(2)  ## Specify the parent folder where topo data will be downloaded or copied to, unzipped, and processed into a final fGDB
+        aoiFc           = arcpy.GetParameterAsText(3)  ## Specify the AOI polygon layer
+        searchDistance  = arcpy.GetParameterAsText(4)  ## Specify the AOI polygon search distance
+        downloadFolder  = os.path.join(outputFolder, "TopoDownloads")  ## The folder where topo data will be downloaded or copied to
+        timeStamp       = time.strftime("%Y%m%d") + "_" + time.strftime("%H%M")  ## A date/time stamp
+        topoIndex       = os.path.join(os.path.dirname(__file__), "UsgsQuadIndex_75Minute.gdb\\UsgsQuadIndex_75Minute")  ## The 7.5-minute topo index polygon layer
+        arcpy.env.overwriteOutput = True
+        arcpy.env.addOutputsToMap = False
 
-    # Copy or append the feature classes from each of the USGS topo vector GDBs into a new fGDB.
-    arcpy.MakeFeatureLayer_management(topoIndex, "clipLyr")  ## Make a feature layer from topoIndex
-    gdbList = arcpy.ListWorkspaces("VECTOR_*", "FileGDB")  ## Get a list of the 7.5-minute USGS topo vector GDBs
-    gdbCount = len(gdbList)
-    for i in range(0, gdbCount):  ## For each of the USGS topo vector GDBs
-        arcpy.AddMessage("\n" + "Processing " + str(i + 1) + " of " + str(gdbCount) + " " + gdbList[i] + "...")
-        arcpy.env.workspace = gdbList[i]  ## Set the home workspace to the current vector topo GDB
+        # Select topoIndex features that are within searchDistance of aoiFc.
+        arcpy.AddMessage("\n\n" + "Selecting USGS 7.5-minute vector topo GDBs within " + searchDistance + " of AOI features...")
+        arcpy.MakeFeatureLayer_management(topoIndex, "topoLyr")
+        arcpy.SelectLayerByLocation_management("topoLyr", "WITHIN_A_DISTANCE", aoiFc, searchDistance, "NEW_SELECTION")
+        if int(arcpy.GetCount_management("topoLyr").getOutput(0)) == 0:  ## Quit before any downloads or copies if no quads were selected
+            arcpy.AddMessage("\n" + "Can't continue!!  No USGS 7.5-minute quads are within " + searchDistance + " of AOI features.")
+            arcpy.Delete_management("topoLyr")
+            sys.exit()
 
-        # Get the clipLyr quad ID from the current GDB name.
-        gdbName = os.path.basename(gdbList[i])
-        quadId  = gdbName.replace(".gdb", ".zip")  ## The quadId value will be used to select a clipLyr feature based on its BASENAME field
+        # Create Python lists of each selected quad's primary state abbreviation and URL.
+        primaryStateList = []
+        urlList = []
+        urlSet = set()  ## The URLs already listed, since index features that share a zip would otherwise download or copy it twice
+        with arcpy.da.SearchCursor("topoLyr", ["PRIM_ABRV", "URL"]) as cursor:
+            for row in cursor:
+                if row[1] not in urlSet:  ## Keep each selected quad once per URL
+                    urlSet.add(row[1])
+                    primaryStateList.append(row[0])
+                    urlList.append(row[1])
+        arcpy.SelectLayerByAttribute_management("topoLyr", "CLEAR_SELECTION")  ## Clear the selection
+        arcpy.Delete_management("topoLyr")  ## Dismiss topoLyr
+        urlCount = len(urlList)
+        basenames = [os.path.basename(url) for url in urlList]  ## Each quad's zip file name
+        dstPaths  = [os.path.join(downloadFolder, basename) for basename in basenames]  ## Each quad's download or copy destination
 
-        # Select the current GDB's corresponding quad frame to act as a clipping polygon.
-        arcpy.SelectLayerByAttribute_management("clipLyr", "NEW_SELECTION", "BASENAME = '" + quadId + "'")  ## Select the GDB's corresponding quad frame
+        # Delete downloadFolder (if it exists), and then recreate it.
+        if arcpy.Exists(downloadFolder):
+            arcpy.Delete_management(downloadFolder)
+        arcpy.CreateFolder_management(outputFolder, "TopoDownloads")
 
-        dsList = arcpy.ListDatasets("", "Feature")  ## Get a list of feature datasets in the current GDB
-        dsList = [''] + dsList if dsList is not None else []  ## Addition of the empty string permits stand-alone feature classes to be discovered
+        # Download selected topo data from online USGS source.
+        if topoSource == "Online":
+            arcpy.AddMessage("\n" + "Downloading:")
+            pool = ThreadPool(max(1, min(16, urlCount)))  ## Download up to 16 quads at a time without overwhelming the USGS host
+            jobs = [(i, urlList[i], dstPaths[i]) for i in range(0, urlCount)]
+            msgs = []
+            for n, (i, downloaded) in enumerate(pool.imap_unordered(downloadQuad, jobs)):  ## Report downloads in batches as they finish
+                if downloaded:
+                    msgs.append("   "                      + str(n + 1) + " of " + str(urlCount) + " " + basenames[i])
+                else:
+                    msgs.append("   !! Couldn't download " + str(n + 1) + " of " + str(urlCount) + " " + basenames[i])
+                addMessages(msgs)
+            addMessages(msgs, True)
+            pool.close()
+            pool.join()
+            for session in workerSessions:  ## Close each download thread's session
+                session.close()
+            del workerSessions[:]
+            urllib.urlcleanup()  ## Clear the download cache once all downloads are done
 
-        for ds in dsList:  ## For each of the feature datasets within the current GDB
-            arcpy.AddMessage("   Feature dataset " + ds + "...")
-            arcpy.env.workspace = os.path.join(gdbList[i], ds)  ## Set the home workspace to the current feature dataset
-            fcList = arcpy.ListFeatureClasses("*")  ## Get a list of feature classes within the current feature dataset
-            for fc in fcList:  ## For each of the feature classes within the current feature dataset
-                if fc == "NHDFlowline":                            ## If the current fc is NhdFlowline
-                    arcpy.env.outputMFlag = "Disabled"             ## Strip measures from NhdFlowline to prevent measures out-of-bounds error
-                    arcpy.CopyFeatures_management (fc, fc + "xx")  ## Copy fc to fcxx
-                    arcpy.Delete_management(fc)                    ## Delete fc
-                    arcpy.Rename_management(fc+"xx", fc)           ## Rename fcxx to fc
-                arcpy.AddMessage("      Feature class " + fc)
-                if not arcpy.Exists(os.path.join(outputFolder, outGdb, fc)):  ## If the target feature class doesn't exist yet
-                    arcpy.Clip_analysis(fc, "clipLyr", os.path.join(outputFolder, outGdb, fc))  ## Clip the current feature class into the target feature class
+        # Copy selected topo data from localTopoFolder.
+        else:
+            arcpy.AddMessage("\n" + "Copying:")
+            pool = ThreadPool(max(1, min(8, urlCount)))  ## Copy up to 8 quads at a time
+            srcPaths = [os.path.join(localTopoFolder, primaryStateList[i], basenames[i]) for i in range(0, urlCount)]  ## Each quad's local source
+            jobs = [(i, srcPaths[i], dstPaths[i]) for i in range(0, urlCount)]
+            msgs = []
+            for n, (i, copied) in enumerate(pool.imap_unordered(copyQuad, jobs)):  ## Report copies in batches as they finish
+                if copied:
+                    msgs.append("   "                  + str(n + 1) + " of " + str(urlCount) + " " + basenames[i])
                 else:
-                    arcpy.Clip_analysis(fc, "clipLyr", "in_memory\\clippedData")  ## Clip the current feature class to an in_memory object
-                    arcpy.Append_management("in_memory\\clippedData", os.path.join(outputFolder, outGdb, fc), "NO_TEST")  ## Append the in_memory object into the target feature class
-                    arcpy.Delete_management("in_memory\\clippedData")  ## Delete the in_memory object
-    arcpy.Delete_management("clipLyr")  ## Dismiss clipLyr
+                    msgs.append("   !! Couldn't copy " + str(n + 1) + " of " + str(urlCount) + " " + basenames[i])
+                addMessages(msgs)
+            addMessages(msgs, True)
+            pool.close()
+            pool.join()
 
-    # Dissolve polygons that were split by quad frames.
-    pfields = {  ## A Python dictionary containing dissolve field names for each polygon-type feature class
-        "NHDArea"              :["FCode","FType","GNIS_Name"],
-        "NHDWaterbody"         :["FCode","FType","GNIS_Name"],
-        "GU_CountyOrEquivalent":["FCode","State_Name","County_Name"],
-        "GU_StateOrTerritory"  :["FCode","State_Name"],
-        "GU_Reserve"           :["FCode","FType","GNIS_ID","Name","AdminType","OwnerOrManagingAgency"],
-        "GU_NativeAmericanArea":["FCode","FType","GNIS_ID","Name"],
-        "LANDCOVER_WOODLAND"   :["FCODE"],
-        "Trans_AirportRunway"  :["FCode","GNIS_ID","FAA_Airport_Code","Name"],
-        "GU_PLSSTownship"      :["PLSSID","SURVTYPTXT","TWNSHPLAB"],
-        "GU_PLSSSpecialSurvey" :["SURVTYPTXT","PERMANENT_IDENTIFIER"],
-        "GU_PLSSFirstDivision" :["FRSTDIVLAB","FRSTDIVTXT","FRSTDIVID","FRSTDIVNO"],
-        "CellGrid_7_5Minute"   :["CELL_MAPCODE","STATE_ALPHA","CELL_NAME"]}
-    arcpy.env.workspace = os.path.join(outputFolder, outGdb)
-    arcpy.AddMessage("\n" + "Dissolving polygon feature class...")
-    arcpy.AddMessage(os.path.join(outputFolder, outGdb))
-    fcList = arcpy.ListFeatureClasses("*", "Polygon")  ## Get a list of polygon FCs in the combined USGS topo vector GDB
-    for fc in fcList:  ## For each polygon FC
-        arcpy.AddMessage("   " + fc + "...")
-        if fc == "GU_PLSSTownship":  ## Construct a Twn-Rng label
-            if not "TWNSHPLAB" in arcpy.ListFields(fc):
-                arcpy.AddField_management(fc, "TWNSHPLAB", "TEXT", "#", "#", 20)
-            exp = '"T" + !PLSSID![4:7].lstrip("0") + !PLSSID![8:9] + " R" + !PLSSID![9:12].lstrip("0") + !PLSSID![13:14]'
-            arcpy.CalculateField_management(fc, "TWNSHPLAB", exp, "PYTHON_9.3")
-        if fc == "GU_PLSSFirstDivision":  ## Construct a Sec label
-            if not "FRSTDIVLAB" in arcpy.ListFields(fc):  
-                arcpy.AddField_management(fc, "FRSTDIVLAB", "TEXT", "#", "#", 15)
-            arcpy.CalculateField_management(fc, "FRSTDIVLAB", '!FRSTDIVNO!.lstrip("0")', "PYTHON_9.3")
-        outFc = "New_" + fc
-        arcpy.Dissolve_management(fc, outFc, pfields[os.path.basename(fc)], "", "SINGLE_PART")  ## Dissolve fc to outFc
-        arcpy.Delete_management(fc)  ## Delete the original fc
-        arcpy.Rename_management(outFc, fc)  ## Rename outFc to fc
+        # Unzip the USGS topo vector downloads.
+        arcpy.env.workspace = downloadFolder
+        arcpy.AddMessage("\n" + "Unzipping...")
+        fileList = sorted([f for f in os.listdir(downloadFolder) if f.lower().endswith(".zip") and os.path.isfile(os.path.join(downloadFolder, f))])  ## Read downloadFolder once, without a trip through arcpy
+        zipCount = len(fileList)
+        if zipCount == 0:
+            arcpy.AddMessage("\n" + "Can't continue!!  No USGS topo vector GDBs were downloaded or copied.")
+            sys.exit()
+        pool = ThreadPool(cpu_count())  ## Unzip one archive per CPU at a time
+        jobs = [(i, os.path.join(downloadFolder, fileList[i]), downloadFolder) for i in range(0, zipCount)]
+        gdbList = []  ## The 7.5-minute USGS topo vector GDBs, as named inside each archive
+        msgs = []
+        for n, (i, gdbNames) in enumerate(pool.imap_unordered(unzipQuad, jobs)):  ## Report archives in batches as they finish
+            msgs.append("   " + str(n + 1) + " of " + str(zipCount) + " " + fileList[i])
+            addMessages(msgs)
+            gdbList.extend([os.path.join(downloadFolder, gdbName) for gdbName in gdbNames])
+        addMessages(msgs, True)
+        pool.close()
+        pool.join()
 
-    # Dissolve lines that were split by quad frames.
-    lfields = {  ## A Python dictionary containing dissolve field names for each line-type feature class
-        "NHDFlowline"                 :["FCode","GNIS_Name"],
-        "NHDLine"                     :["FCode","GNIS_Name"],
-        "Trans_RailFeature"           :["FCode","Name"],
-        "GU_InternationalBoundaryLine":["FCODE","COUNTRY_FIPSCODE","COUNTRY_NAME"],
-        "Trans_RoadSegment"           :["INTERSTATE","US_ROUTE","STATE_ROUTE","COUNTY_ROUTE","FEDERAL_LANDS_ROUTE","TNMFRC","FULL_STREET_NAME"],
-        "Trans_RoadSegment_NTDNOFS"   :["INTERSTATE","US_ROUTE","STATE_ROUTE","COUNTY_ROUTE","FEDERAL_LANDS_ROUTE","TNMFRC","FULL_STREET_NAME"],
-        "Trans_RoadSegment_USFS"      :["INTERSTATE","US_ROUTE","STATE_ROUTE","COUNTY_ROUTE","FEDERAL_LANDS_ROUTE","TNMFRC","FULL_STREET_NAME"],
-        "Elev_Contour"                :["FCode","ContourElevation"],
-        "Trans_TrailSegment"          :["FCODE","NAME","TRAILNUMBER"]}
-    arcpy.AddMessage("\n" + "Dissolving line feature class...")
-    arcpy.AddMessage(os.path.join(outputFolder, outGdb))
-    fcList = arcpy.ListFeatureClasses("*", "Line")  ## Get a list of line FCs in the combined USGS topo vector GDB
-    for fc in fcList:  ## For each line FC
-        arcpy.AddMessage("   " + fc + "...")
-        outFc = "New_" + fc
-        arcpy.Dissolve_management(fc, outFc, lfields[os.path.basename(fc)], "", "SINGLE_PART")  ## Dissolve fc to outFc
-        arcpy.Delete_management(fc)  ## Delete the original fc
-        arcpy.Rename_management(outFc, fc)  ## Rename outFc to fc
+        # Create the output GDB, and a scratch GDB for the feature classes that will be dissolved into it.
+        arcpy.AddMessage("\n" + "Creating the output fGDB...")
+        outGdb = "Aoi_VectorTopo_" + timeStamp + ".gdb"
+        arcpy.CreateFileGDB_management(outputFolder, outGdb)
+        scratchGdb = "Scratch_VectorTopo_" + timeStamp + ".gdb"
+        arcpy.CreateFileGDB_management(outputFolder, scratchGdb)
 
-    # Add a template LYR file to the TOC, and re-source it to the new topo vector GDB.
-    arcpy.AddMessage("\n" + "Re-sourcing the USGS Topo Vector layers to the USGS Topo Vector GDB...")
-    mapDoc = arcpy.mapping.MapDocument("Current")
-    df = arcpy.mapping.ListDataFrames(mapDoc)[0]
-    lyrFile = arcpy.mapping.Layer(os.path.join(os.path.dirname(__file__), "UsgsTopoVector.lyr"))
-    lyrList = arcpy.mapping.ListLayers(lyrFile, "*", df)
-    for lyr in lyrList:
-        if not lyr.isGroupLayer and lyr.isFeatureLayer and lyr.supports("DATASOURCE"):
-            try:
-                lyr.replaceDataSource(os.path.join(outputFolder, outGdb), "FILEGDB_WORKSPACE")
-                arcpy.AddMessage("   Re-sourcing " + lyr.name + "...")
-            except:  ## Bypass LYR file layers that do not have a corresponding feature class in outGdb
-                arcpy.AddMessage("   !! Couldn't re-source " + lyr.name + "...")
-                pass
+        # Copy or append the feature classes from each of the USGS topo vector GDBs into a new fGDB.
+        gdbList = sorted(set(gdbList))  ## Process the unzipped GDBs in a stable order
+        gdbCount = len(gdbList)
+        if gdbCount == 0:
+            arcpy.AddMessage("\n" + "Can't continue!!  No USGS topo vector GDBs were unzipped.")
+            sys.exit()
+
+        # Read every GDB's corresponding quad frame from topoIndex in a single pass, to act as clipping polygons.
+        quadIds = [os.path.basename(gdb)[:-4] + ".zip" for gdb in gdbList]  ## The quadId values match topoIndex features based on their BASENAME field
+        exp = "BASENAME IN (" + ", ".join(["'" + quadId.replace("'", "''") + "'" for quadId in quadIds]) + ")"
+        frames = {}  ## The quad frame polygons, keyed by BASENAME
+        with arcpy.da.SearchCursor(topoIndex, ["BASENAME", "SHAPE@"], exp) as cursor:
+            for row in cursor:
+                frames[row[0]] = row[1] if row[0] not in frames else frames[row[0]].union(row[1])  ## Coastal and border quads can have several frame polygons
+        targets = {}  ## The target feature class of each clipped feature class, keyed by feature class name
+        arcpy.env.outputMFlag = "Disabled"  ## Clip without measures to prevent NhdFlowline's measures out-of-bounds error
+        for i in range(0, gdbCount):  ## For each of the USGS topo vector GDBs
+            arcpy.AddMessage("\n" + "Processing " + str(i + 1) + " of " + str(gdbCount) + " " + gdbList[i] + "...")
+            arcpy.env.workspace = gdbList[i]  ## Set the home workspace to the current vector topo GDB
 
-    # Save the re-sourced LYR file to outputFolder.
-    for lyr in lyrList:
-        if lyr.isGroupLayer and lyr.name == "UsgsTopoVector":
-            lyr.saveACopy(os.path.join(outputFolder, "Aoi_VectorTopo_" + timeStamp + ".lyr"))
+            # Get the current GDB's corresponding quad frame to act as a clipping polygon.
+            quadId = quadIds[i]
+            if quadId not in frames:  ## Bypass GDBs that do not have a corresponding quad frame
+                arcpy.AddMessage("   !! Couldn't find the quad frame for " + os.path.basename(gdbList[i]) + "...")
+                continue
 
-    # Add the new LYR file to the TOC, center, and zoom to 100K scale.
-    lyrFile = arcpy.mapping.Layer(os.path.join(outputFolder, "Aoi_VectorTopo_" + timeStamp + ".lyr"))
-    arcpy.mapping.AddLayer(df, lyrFile, "Bottom")
-    for lyr in lyrList:
-        if lyr.name == 'Quad frame':
-            ext = lyr.getExtent()
-            df.extent = ext
-            df.scale = 100000
+            dsList = arcpy.ListDatasets("", "Feature")  ## Get a list of feature datasets in the current GDB
+            dsList = [''] + dsList if dsList is not None else []  ## Addition of the empty string permits stand-alone feature classes to be discovered
 
-    del mapDoc, df, lyrFile
-    arcpy.env.addOutputsToMap = True
-    arcpy.RefreshActiveView()
-    arcpy.RefreshCatalog(outputFolder)
+            fcCount = 0  ## The count of feature classes clipped from the current GDB
+            for ds in dsList:  ## For each of the feature datasets within the current GDB
+                arcpy.env.workspace = os.path.join(gdbList[i], ds)  ## Set the home workspace to the current feature dataset
+                fcList = arcpy.ListFeatureClasses("*")  ## Get a list of feature classes within the current feature dataset
+                for fc in fcList:  ## For each of the feature classes within the current feature dataset
+                    if fc not in targets:  ## If the target feature class doesn't exist yet
+                        if arcpy.Describe(fc).shapeType in ("Polygon", "Polyline"):  ## Polygons and lines are dissolved into outGdb later
+                            targets[fc] = os.path.join(outputFolder, scratchGdb, fc)
+                        else:
+                            targets[fc] = os.path.join(outputFolder, outGdb, fc)
+                        arcpy.Clip_analysis(fc, frames[quadId], targets[fc])  ## Clip the current feature class into the target feature class
+                    else:
+                        arcpy.Clip_analysis(fc, frames[quadId], "in_memory\\clippedData")  ## Clip the current feature class to an in_memory object
+                        arcpy.Append_management("in_memory\\clippedData", targets[fc], "NO_TEST")  ## Append the in_memory object into the target feature class
+                        arcpy.Delete_management("in_memory\\clippedData")  ## Delete the in_memory object
+                    fcCount += 1
+            arcpy.AddMessage("   " + str(fcCount) + " feature classes clipped")  ## One summary line per GDB instead of one line per feature class
 
-    arcpy.AddWarning("\n" + "OK, done!")
-    arcpy.AddWarning("\n" + "The new USGS topo vector geodatabase is located at:")
-    arcpy.AddWarning("   " + os.path.join(outputFolder, outGdb))
-    arcpy.AddWarning("\n" + "The new USGS topo vector LYR file is located at:")
-    arcpy.AddWarning("   " + os.path.join(outputFolder, "Aoi_VectorTopo_" + timeStamp + ".lyr") + "\n\n")
+        # Dissolve polygons that were split by quad frames.
+        pfields = {  ## A Python dictionary containing dissolve field names for each polygon-type feature class
+            "NHDArea"              :["FCode","FType","GNIS_Name"],
+            "NHDWaterbody"         :["FCode","FType","GNIS_Name"],
+            "GU_CountyOrEquivalent":["FCode","State_Name","County_Name"],
+            "GU_StateOrTerritory"  :["FCode","State_Name"],
+            "GU_Reserve"           :["FCode","FType","GNIS_ID","Name","AdminType","OwnerOrManagingAgency"],
+            "GU_NativeAmericanArea":["FCode","FType","GNIS_ID","Name"],
+            "LANDCOVER_WOODLAND"   :["FCODE"],
+            "Trans_AirportRunway"  :["FCode","GNIS_ID","FAA_Airport_Code","Name"],
+            "GU_PLSSTownship"      :["PLSSID","SURVTYPTXT","TWNSHPLAB"],
+            "GU_PLSSSpecialSurvey" :["SURVTYPTXT","PERMANENT_IDENTIFIER"],
+            "GU_PLSSFirstDivision" :["FRSTDIVLAB","FRSTDIVTXT","FRSTDIVID","FRSTDIVNO"],
+            "CellGrid_7_5Minute"   :["CELL_MAPCODE","STATE_ALPHA","CELL_NAME"]}
+        arcpy.env.workspace = os.path.join(outputFolder, scratchGdb)
+        arcpy.AddMessage("\n" + "Dissolving polygon feature class...")
+        arcpy.AddMessage(os.path.join(outputFolder, outGdb))
+        fcList = arcpy.ListFeatureClasses("*", "Polygon")  ## Get a list of polygon FCs in the combined USGS topo vector GDB
+        for fc in fcList:  ## For each polygon FC
+            arcpy.AddMessage("   " + fc + "...")
+            fieldNames = set([field.name for field in arcpy.ListFields(fc)])  ## The names of fc's fields
+            if fc == "GU_PLSSTownship":  ## Construct a Twn-Rng label
+                if not "TWNSHPLAB" in fieldNames:
+                    arcpy.AddField_management(fc, "TWNSHPLAB", "TEXT", "#", "#", 20)
+                with arcpy.da.UpdateCursor(fc, ["PLSSID", "TWNSHPLAB"]) as uRows:
+                    for uRow in uRows:
+                        if uRow[0]:
+                            uRows.updateRow([uRow[0], "T" + uRow[0][4:7].lstrip("0") + uRow[0][8:9] + " R" + uRow[0][9:12].lstrip("0") + uRow[0][13:14]])
+            if fc == "GU_PLSSFirstDivision":  ## Construct a Sec label
+                if not "FRSTDIVLAB" in fieldNames:
+                    arcpy.AddField_management(fc, "FRSTDIVLAB", "TEXT", "#", "#", 15)
+                with arcpy.da.UpdateCursor(fc, ["FRSTDIVNO", "FRSTDIVLAB"]) as uRows:
+                    for uRow in uRows:
+                        if uRow[0]:
+                            uRows.updateRow([uRow[0], uRow[0].lstrip("0")])
+            outFc = os.path.join(outputFolder, outGdb, fc)
+            arcpy.Dissolve_management(fc, outFc, pfields[os.path.basename(fc)], "", "SINGLE_PART")  ## Dissolve fc to outFc
 
-except SystemExit:
-    pass
+        # Dissolve lines that were split by quad frames.
+        lfields = {  ## A Python dictionary containing dissolve field names for each line-type feature class
+            "NHDFlowline"                 :["FCode","GNIS_Name"],
+            "NHDLine"                     :["FCode","GNIS_Name"],
+            "Trans_RailFeature"           :["FCode","Name"],
+            "GU_InternationalBoundaryLine":["FCODE","COUNTRY_FIPSCODE","COUNTRY_NAME"],
+            "Trans_RoadSegment"           :["INTERSTATE","US_ROUTE","STATE_ROUTE","COUNTY_ROUTE","FEDERAL_LANDS_ROUTE","TNMFRC","FULL_STREET_NAME"],
+            "Trans_RoadSegment_NTDNOFS"   :["INTERSTATE","US_ROUTE","STATE_ROUTE","COUNTY_ROUTE","FEDERAL_LANDS_ROUTE","TNMFRC","FULL_STREET_NAME"],
+            "Trans_RoadSegment_USFS"      :["INTERSTATE","US_ROUTE","STATE_ROUTE","COUNTY_ROUTE","FEDERAL_LANDS_ROUTE","TNMFRC","FULL_STREET_NAME"],
+            "Elev_Contour"                :["FCode","ContourElevation"],
+            "Trans_TrailSegment"          :["FCODE","NAME","TRAILNUMBER"]}
+        arcpy.AddMessage("\n" + "Dissolving line feature class...")
+        arcpy.AddMessage(os.path.join(outputFolder, outGdb))
+        fcList = arcpy.ListFeatureClasses("*", "Line")  ## Get a list of line FCs in the combined USGS topo vector GDB
+        for fc in fcList:  ## For each line FC
+            arcpy.AddMessage("   " + fc + "...")
+            outFc = os.path.join(outputFolder, outGdb, fc)
+            arcpy.Dissolve_management(fc, outFc, lfields[os.path.basename(fc)], "", "SINGLE_PART")  ## Dissolve fc to outFc
+        arcpy.env.workspace = os.path.join(outputFolder, outGdb)
+        arcpy.Delete_management(os.path.join(outputFolder, scratchGdb))  ## Delete scratchGdb and its undissolved feature classes
+
+        # Add a template LYR file to the TOC, and re-source it to the new topo vector GDB.
+        arcpy.AddMessage("\n" + "Re-sourcing the USGS Topo Vector layers to the USGS Topo Vector GDB...")
+        mapDoc = arcpy.mapping.MapDocument("Current")
+        df = arcpy.mapping.ListDataFrames(mapDoc)[0]
+        lyrFile = arcpy.mapping.Layer(os.path.join(os.path.dirname(__file__), "UsgsTopoVector.lyr"))
+        lyrList = arcpy.mapping.ListLayers(lyrFile, "*", df)
+        for lyr in lyrList:
+            if not lyr.isGroupLayer and lyr.isFeatureLayer and lyr.supports("DATASOURCE"):
+                try:
+                    lyr.replaceDataSource(os.path.join(outputFolder, outGdb), "FILEGDB_WORKSPACE")
+                    arcpy.AddMessage("   Re-sourcing " + lyr.name + "...")
+                except:  ## Bypass LYR file layers that do not have a corresponding feature class in outGdb
+                    arcpy.AddMessage("   !! Couldn't re-source " + lyr.name + "...")
+                    pass
+
+        # Save the re-sourced LYR file to outputFolder.
+        for lyr in lyrList:
+            if lyr.isGroupLayer and lyr.name == "UsgsTopoVector":
+                lyr.saveACopy(os.path.join(outputFolder, "Aoi_VectorTopo_" + timeStamp + ".lyr"))
+
+        # Add the new LYR file to the TOC, center, and zoom to 100K scale.
+        lyrFile = arcpy.mapping.Layer(os.path.join(outputFolder, "Aoi_VectorTopo_" + timeStamp + ".lyr"))
+        arcpy.mapping.AddLayer(df, lyrFile, "Bottom")
+        for lyr in lyrList:
+            if lyr.name == 'Quad frame':
+                ext = lyr.getExtent()
+                df.extent = ext
+                df.scale = 100000
+
+        del mapDoc, df, lyrFile
+        arcpy.env.addOutputsToMap = True
+        arcpy.RefreshActiveView()
+        arcpy.RefreshCatalog(outputFolder)
+
+        arcpy.AddWarning("\n" + "OK, done!")
+        arcpy.AddWarning("\n" + "The new USGS topo vector geodatabase is located at:")
+        arcpy.AddWarning("   " + os.path.join(outputFolder, outGdb))
+        arcpy.AddWarning("\n" + "The new USGS topo vector LYR file is located at:")
+        arcpy.AddWarning("   " + os.path.join(outputFolder, "Aoi_VectorTopo_" + timeStamp + ".lyr") + "\n\n")
+
+    except SystemExit:
+        pass
+
+    except:
+        arcpy.AddMessage("\n")
+        arcpy.AddError(arcpy.GetMessages(2))
+        arcpy.AddMessage("\n")
+
+    finally:
+        # Delete scratchGdb if the tool stopped before dissolving its feature classes.
+        if scratchGdb and arcpy.Exists(os.path.join(outputFolder, scratchGdb)):
+            try:
+                arcpy.env.workspace = outputFolder  ## Release scratchGdb as the workspace before deleting it
+                arcpy.Delete_management(os.path.join(outputFolder, scratchGdb))
+            except:
+                pass
 
-except:
-    arcpy.AddMessage("\n")
-    arcpy.AddError(arcpy.GetMessages(2))
-    arcpy.AddMessage("\n")
\ No newline at end of file
+if __name__ == "__main__":
+    main()